@@ -1,3 +1,4 @@
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -7,12 +8,22 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 try:
     from src.core import ProductResolver, LogSearcher
-    from src.interface import print_header, print_error, display_results, select_log, view_file
+    from src.summarizer import LogSummarizer
+    from src.agent import AgentAggregator, create_agent_server, DEFAULT_AGENT_PORT
+    from src.analytics import YieldAnalyzer
+    from src.indexer import ContentIndex
+    from src.prefetch import LogPrefetcher
+    from src.interface import print_header, print_error, display_results, display_stats, display_matches, select_log, view_file
 except ImportError  as e:
     # If running directly from src folder or structure is different
     try:
         from core import ProductResolver, LogSearcher
-        from interface import print_header, print_error, display_results, select_log, view_file
+        from summarizer import LogSummarizer
+        from agent import AgentAggregator, create_agent_server, DEFAULT_AGENT_PORT
+        from analytics import YieldAnalyzer
+        from indexer import ContentIndex
+        from prefetch import LogPrefetcher
+        from interface import print_header, print_error, display_results, display_stats, display_matches, select_log, view_file
     except ImportError:
         print(f"Critical Error: Could not import modules: {e}")
         sys.exit(1)
@@ -28,11 +39,42 @@ DEFAULT_PATHS = [
     "/usr/flexfs/lion_cub/log/dbg/customization"
 ]
 
+# Shared between sessions and users, so each log is only processed once
+DEFAULT_CACHE_DIR = os.environ.get("LOGS_READER_CACHE", "/usr/flexfs/users/logs_reader_cache")
+
+# Private to this user: holds decompressed copies of logs about to be viewed
+DEFAULT_PREFETCH_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "logs_reader", "prefetch")
+
+def month_arg(value: str) -> str:
+    """Accepts YYYY-MM or YYYYMM, returns YYYY-MM."""
+    digits = value.replace("-", "")
+    if len(digits) != 6 or not digits.isdigit():
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got '{value}'")
+    return f"{digits[:4]}-{digits[4:]}"
+
 def main():
     parser = argparse.ArgumentParser(description="Log Reader for FT/Customization Logs")
     parser.add_argument("sn", nargs='?', help="Serial Number to search for")
     parser.add_argument("--pn", help="Directly specify Product Number (skip lookup)")
     parser.add_argument("--path", action='append', help="Add custom search path")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Shared cache directory")
+    parser.add_argument("--no-summary", action='store_true', help="Do not scan logs for failure signatures")
+    parser.add_argument("--signature", action='append', help="Failure signature regex (replaces the defaults)")
+    parser.add_argument("--serve", action='store_true', help="Run as a search agent for the search paths")
+    parser.add_argument("--host", default="127.0.0.1", help="Agent listen address (with --serve, unauthenticated)")
+    parser.add_argument("--port", type=int, default=DEFAULT_AGENT_PORT, help="Agent listen port (with --serve)")
+    parser.add_argument("--agent", action='append', help="Search via remote agent HOST[:PORT] instead of locally")
+    parser.add_argument("--agent-timeout", type=float, default=15.0, help="Seconds to wait for agents")
+    parser.add_argument("--stats", metavar="PN", help="Print per-month pass/fail counts for a PN and exit")
+    parser.add_argument("--since", type=month_arg, help="First month for --stats (YYYY-MM)")
+    parser.add_argument("--until", type=month_arg, help="Last month for --stats (YYYY-MM)")
+    parser.add_argument("--index", metavar="PN", action='append', help="Build/update the content index for a PN and exit")
+    parser.add_argument("--grep", metavar="TEXT", help="Find units whose logs contain an error line with TEXT and exit")
+    parser.add_argument("--prefetch", type=int, default=5, help="Number of most recent logs to fetch ahead (0 to disable)")
+    parser.add_argument("--prefetch-dir", default=DEFAULT_PREFETCH_DIR, help="Local cache for prefetched logs")
+    parser.add_argument("--prefetch-mb", type=int, default=512, help="Size cap of the prefetch cache in MB")
     
     args = parser.parse_args()
     
@@ -43,6 +85,41 @@ def main():
     pn = args.pn
     search_paths = args.path if args.path else DEFAULT_PATHS
 
+    if args.serve:
+        server = create_agent_server(search_paths, args.host, args.port, cache_dir=args.cache_dir)
+        host, port = server.server_address[:2]
+        print(f"Agent listening on {host}:{port} for {len(search_paths)} directories", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.stats:
+        analyzer = YieldAnalyzer(search_paths, cache_dir=args.cache_dir)
+        months = analyzer.report(args.stats, since=args.since, until=args.until)
+        display_stats(args.stats, months, analyzer.top_failures(months))
+        print(f"({analyzer.parsed_months} of {len(months)} months re-parsed)")
+        sys.exit(0)
+
+    if args.index or args.grep:
+        content_index = ContentIndex(os.path.join(args.cache_dir, "content_index"), signatures=args.signature)
+        if args.index:
+            print(f"Indexing logs of {', '.join(args.index)}...")
+            content_index.build(LogSearcher(search_paths), args.index)
+            print(f"Index updated ({content_index.extracted} logs read).")
+        if args.grep:
+            display_matches(args.grep, content_index.query(args.grep))
+        sys.exit(0)
+
+    summarizer = None if args.no_summary else LogSummarizer(cache_dir=args.cache_dir, signatures=args.signature)
+    prefetcher = None
+    if args.prefetch > 0:
+        try:
+            prefetcher = LogPrefetcher(args.prefetch_dir, max_bytes=args.prefetch_mb * 1024 * 1024)
+        except OSError as e:
+            print_error(f"Prefetching disabled: {e}")
+
     while True:
         # 1. Acquire SN
         if not sn:
@@ -75,11 +152,27 @@ def main():
                 print(f"Resolved PN: {current_pn}")
         
         # 3. Search
-        print(f"Searching in: {len(search_paths)} directories...")
-        searcher = LogSearcher(search_paths)
+        if args.agent:
+            print(f"Searching via {len(args.agent)} agents...")
+            searcher = AgentAggregator(args.agent, timeout=args.agent_timeout)
+        else:
+            print(f"Searching in: {len(search_paths)} directories...")
+            searcher = LogSearcher(search_paths)
         logs = searcher.search(current_pn, sn)
+
+        if args.agent:
+            for agent, error in searcher.errors.items():
+                print_error(f"Agent {agent} skipped: {error}")
+
+        if summarizer and logs:
+            print(f"Summarizing {len(logs)} logs...")
+            summarizer.summarize_all(logs)
         
         display_results(logs)
+
+        # Logs are now sorted newest first, the likely next ones to open
+        if prefetcher and logs:
+            prefetcher.prefetch([log['path'] for log in logs[:args.prefetch]])
         
         # 4. Interact
         if logs:
@@ -96,7 +189,7 @@ def main():
                     break # Break inner loop, returns to top of while True
                 else:
                     # View File
-                    view_file(logs[choice_idx]['path'])
+                    view_file(logs[choice_idx]['path'], prefetcher)
                     # Loop continues, allowing viewing another file
         else:
             # If no logs found, ask what to do
@@ -0,0 +1,246 @@
+import os
+import json
+import socket
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import List, Dict, Optional
+
+try:
+    from src.core import LogSearcher, content_hash, sampled_hash, merge_log_entry
+    from src.cache import DiskCache, file_key
+except ImportError:
+    from core import LogSearcher, content_hash, sampled_hash, merge_log_entry
+    from cache import DiskCache, file_key
+
+
+DEFAULT_AGENT_PORT = 8765
+HASH_TIMEOUT = 5.0  # Confirming a duplicate must not hold up the results for long
+
+
+def _is_plain_name(value: str) -> bool:
+    return not any(c in value for c in ("/", "\\", "\0")) and ".." not in value
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _AgentHandler(BaseHTTPRequestHandler):
+    """
+    Protocol:
+      GET /ping                 -> "ok"
+      GET /search?pn=..&sn=..   -> one JSON log entry per line, streamed
+                                   root by root as they are searched.
+                                   Entries carry 'inode', 'size' and
+                                   'sampled_hash' (cheap to compute) so the
+                                   aggregator can spot duplicate candidates.
+      GET /hash?path=..         -> {"content_hash": ..} for a log under
+                                   the roots, to confirm a candidate
+    """
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        params = urllib.parse.parse_qs(url.query)
+
+        if url.path == "/ping":
+            self._send_head(200, "text/plain")
+            self.wfile.write(b"ok\n")
+            return
+
+        if url.path == "/hash" and params.get("path"):
+            self._send_hash(params["path"][0])
+            return
+
+        if url.path != "/search" or not params.get("pn") or not params.get("sn"):
+            self._send_head(400, "text/plain")
+            self.wfile.write(b"usage: /search?pn=<PN>&sn=<SN>\n")
+            return
+
+        pn, sn = params["pn"][0], params["sn"][0]
+        if not _is_plain_name(pn) or not _is_plain_name(sn):
+            # pn becomes a path component, never let it leave the roots
+            self._send_head(400, "text/plain")
+            self.wfile.write(b"pn and sn must be plain names\n")
+            return
+
+        self._send_head(200, "application/x-ndjson")
+        try:
+            # Search one root at a time so the aggregator gets early results
+            for root in self.server.root_dirs:
+                for log in LogSearcher([root]).search(pn, sn):
+                    try:
+                        st = os.stat(log["path"])
+                        log["inode"] = [st.st_dev, st.st_ino]
+                        log["size"] = st.st_size
+                        log["sampled_hash"] = sampled_hash(log["path"], st.st_size)
+                    except OSError:
+                        pass
+                    self.wfile.write((json.dumps(log) + "\n").encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Aggregator gave up on us, nothing to do
+            pass
+
+    def _send_hash(self, path: str):
+        real_path = os.path.realpath(path)
+        inside_roots = any(
+            os.path.commonpath([real_path, os.path.realpath(root)]) == os.path.realpath(root)
+            for root in self.server.root_dirs)
+        key = file_key(real_path) if inside_roots and os.path.isfile(real_path) else None
+        if key is None:
+            self._send_head(404, "text/plain")
+            self.wfile.write(b"no such log under the agent's roots\n")
+            return
+
+        # Full hashes read the whole log: compute each one once
+        cache = self.server.hash_cache
+        digest = cache.get(list(key)) if cache else None
+        if digest is None:
+            digest = content_hash(real_path)
+            if digest is not None and cache:
+                cache.put(list(key), digest)
+
+        self._send_head(200, "application/json")
+        self.wfile.write(json.dumps({"content_hash": digest}).encode('utf-8'))
+
+    def _send_head(self, code: int, content_type: str):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Keep the agent console quiet
+        pass
+
+
+def create_agent_server(root_dirs: List[str], host: str = "127.0.0.1",
+                        port: int = DEFAULT_AGENT_PORT, cache_dir: Optional[str] = None) -> HTTPServer:
+    """
+    Creates (but does not start) a search agent serving LogSearcher
+    results for root_dirs. Port 0 picks a free port. Full content hashes
+    are cached in cache_dir when given.
+    There is no authentication: only bind to a non-local address on a
+    trusted network.
+    """
+    server = _ThreadingHTTPServer((host, port), _AgentHandler)
+    server.root_dirs = list(root_dirs)
+    server.hash_cache = DiskCache(cache_dir, "content_hashes") if cache_dir else None
+    return server
+
+
+class AgentAggregator:
+    """
+    Fans a search out to several agents concurrently and merges their
+    streamed results. Same `search(pn, sn)` interface as LogSearcher.
+
+    Agents that are down or slower than `timeout` seconds are skipped;
+    whatever they streamed before the deadline is still returned.
+    Duplicates are collapsed into one entry listing all locations: entries
+    of one agent with the same (st_dev, st_ino) directly, entries with the
+    same size and sampled hash only once their agents confirm the full
+    content hash.
+    """
+
+    def __init__(self, agents: List[str], timeout: float = 15.0):
+        self.agents = [self._normalize(a) for a in agents]
+        self.timeout = timeout
+        self.errors = {}  # type: Dict[str, str]
+
+    @staticmethod
+    def _normalize(agent: str) -> str:
+        if "://" not in agent:
+            agent = "http://" + agent
+        if agent.count(":") < 2:
+            agent = f"{agent}:{DEFAULT_AGENT_PORT}"
+        return agent.rstrip("/")
+
+    def search(self, pn: str, sn: str) -> List[Dict]:
+        self.errors = {}
+        results = []
+        lock = threading.Lock()
+        deadline = time.monotonic() + self.timeout
+        query = urllib.parse.urlencode({"pn": pn, "sn": sn})
+
+        def fetch(agent: str):
+            try:
+                with urllib.request.urlopen(f"{agent}/search?{query}", timeout=self.timeout) as resp:
+                    for line in resp:
+                        if time.monotonic() > deadline:
+                            raise socket.timeout("deadline exceeded")
+                        if not line.strip():
+                            continue
+                        log = json.loads(line.decode('utf-8'))
+                        log["agent"] = agent
+                        with lock:
+                            results.append(log)
+            except Exception as e:
+                with lock:
+                    self.errors[agent] = str(e)
+
+        pool = ThreadPoolExecutor(max_workers=max(1, len(self.agents)))
+        futures = {pool.submit(fetch, agent): agent for agent in self.agents}
+        _, pending = wait(futures, timeout=self.timeout)
+        # Don't block on stragglers; their threads end with the socket timeout
+        pool.shutdown(wait=False)
+
+        with lock:
+            for future in pending:
+                self.errors.setdefault(futures[future], "timed out")
+            results = list(results)
+        return self._collapse_duplicates(results)
+
+    def _collapse_duplicates(self, logs: List[Dict]) -> List[Dict]:
+        # 1. Same file (or hard link) seen by one agent under several roots
+        by_inode = {}
+        candidates = []
+        for log in logs:
+            if log.get("inode"):
+                key = (log["agent"], tuple(log["inode"]))
+                if key in by_inode:
+                    merge_log_entry(by_inode[key], log)
+                    continue
+                by_inode[key] = log
+            candidates.append(log)
+
+        # 2. Same size and sampled hash: confirm with the full hash,
+        #    which agents only compute for these colliding entries
+        buckets = {}
+        for log in candidates:
+            if log.get("size") is not None and log.get("sampled_hash"):
+                buckets.setdefault((log["size"], log["sampled_hash"]), []).append(log)
+        colliding = [log for bucket in buckets.values() if len(bucket) > 1 for log in bucket]
+        full_hashes = {}
+        if colliding:
+            with ThreadPoolExecutor(max_workers=min(8, len(colliding))) as pool:
+                for log, digest in zip(colliding, pool.map(self._fetch_content_hash, colliding)):
+                    full_hashes[id(log)] = digest
+
+        unique = []
+        by_content = {}
+        for log in candidates:
+            digest = full_hashes.get(id(log))
+            if digest is None:
+                # Unconfirmed: better listed twice than hidden
+                unique.append(log)
+                continue
+            key = (log["size"], digest)
+            if key in by_content:
+                merge_log_entry(by_content[key], log)
+            else:
+                by_content[key] = log
+                unique.append(log)
+        return unique
+
+    def _fetch_content_hash(self, log: Dict) -> Optional[str]:
+        query = urllib.parse.urlencode({"path": log["path"]})
+        try:
+            with urllib.request.urlopen(f"{log['agent']}/hash?{query}",
+                                        timeout=min(self.timeout, HASH_TIMEOUT)) as resp:
+                return json.loads(resp.read().decode('utf-8')).get("content_hash")
+        except Exception:
+            return None
@@ -0,0 +1,142 @@
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional, the array module is enough for counting
+    np = None
+
+try:
+    from src.core import LogSearcher, classify_description, group_duplicates
+    from src.cache import DiskCache, file_key
+except ImportError:
+    from core import LogSearcher, classify_description, group_duplicates
+    from cache import DiskCache, file_key
+
+
+STATUS_OTHER, STATUS_PASS, STATUS_FAIL = 0, 1, 2
+_STATUS_CODES = {None: STATUS_OTHER, "pass": STATUS_PASS, "fail": STATUS_FAIL}
+
+# Bump when the rollup format or parsing rules change
+ROLLUP_VERSION = 2
+
+
+def normalize_failure(line: str) -> str:
+    """
+    Collapses per-unit details (SNs, numbers, timestamps) so that the
+    same failure on different units counts as one description.
+    """
+    line = re.sub(r"0x[0-9a-fA-F]+", "#", line)
+    line = re.sub(r"\d+", "#", line)
+    return " ".join(line.split())
+
+
+class YieldAnalyzer:
+    """
+    Per-PN, per-month pass/fail counts and top failure descriptions,
+    computed from the .mlnx index files.
+
+    Each month (across all roots) is parsed into a rollup that is cached
+    under the (path, mtime, size) of its .mlnx files, so re-running a report
+    only re-parses the months that changed. Duplicate .mlnx files are
+    counted once.
+    """
+
+    def __init__(self, root_dirs: List[str], cache_dir: Optional[str] = None):
+        self.searcher = LogSearcher(root_dirs)
+        self.cache = DiskCache(cache_dir, "rollups") if cache_dir else None
+        self.parsed_months = 0  # Months actually parsed (cache misses) in the last report
+
+    def report(self, pn: str, since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Returns {"YYYY-MM": rollup} for every month in [since, until].
+        A rollup is {"pass": n, "fail": n, "other": n, "failures": {desc: n}}.
+        """
+        self.parsed_months = 0
+
+        # The same month usually exists under several roots
+        month_dirs = {}
+        for month, month_dir in self.searcher.iter_month_dirs(pn):
+            if (since and month < since) or (until and month > until):
+                continue
+            month_dirs.setdefault(month, []).append(month_dir)
+
+        months = {}
+        for month in sorted(month_dirs):
+            months[month] = self._month_rollup(pn, month, month_dirs[month])
+        return months
+
+    @staticmethod
+    def top_failures(months: Dict[str, Dict], limit: int = 10) -> List:
+        total = Counter()
+        for rollup in months.values():
+            total.update(rollup["failures"])
+        return total.most_common(limit)
+
+    def _month_rollup(self, pn: str, month: str, month_dirs: List[Path]) -> Dict:
+        keys = []
+        for month_dir in month_dirs:
+            for item in sorted(month_dir.glob("*.mlnx")):
+                key = file_key(str(item))
+                if key is not None and item.is_file():
+                    keys.append(key)
+
+        cache_key = [ROLLUP_VERSION, pn, month, keys]
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        self.parsed_months += 1
+        # An .mlnx copied or hard-linked under two roots must count once
+        unique = [group[0] for group in group_duplicates([k[0] for k in keys])]
+        rollup = self._parse_month(unique)
+        if self.cache:
+            self.cache.put(cache_key, rollup)
+        return rollup
+
+    def _parse_month(self, mlnx_files: List[str]) -> Dict:
+        # Columnar: one status code per line, plus an interned
+        # failure-description id per failing line
+        statuses = array('B')
+        failure_ids = array('L')
+        failure_names = {}  # type: Dict[str, int]
+
+        for mlnx in mlnx_files:
+            try:
+                with open(mlnx, 'r', errors='ignore') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        code = _STATUS_CODES[classify_description(line)]
+                        statuses.append(code)
+                        if code == STATUS_FAIL:
+                            desc = normalize_failure(line)
+                            failure_ids.append(failure_names.setdefault(desc, len(failure_names)))
+            except Exception:
+                pass
+
+        status_counts = self._bincount(statuses, 3)
+        failure_counts = self._bincount(failure_ids, len(failure_names))
+        return {
+            "pass": status_counts[STATUS_PASS],
+            "fail": status_counts[STATUS_FAIL],
+            "other": status_counts[STATUS_OTHER],
+            "failures": {desc: failure_counts[idx] for desc, idx in failure_names.items()},
+        }
+
+    @staticmethod
+    def _bincount(values: array, size: int) -> List[int]:
+        if np is not None and len(values):
+            data = np.frombuffer(values, dtype='u%d' % values.itemsize)
+            counts = np.bincount(data, minlength=size)
+            return [int(c) for c in counts]
+        counts = [0] * size
+        for v in values:
+            counts[v] += 1
+        return counts
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple
+
+
+def file_key(file_path: str) -> Optional[Tuple[str, float, int]]:
+    """
+    Identity of a file's current contents: (path, mtime, size).
+    Returns None if the file cannot be stat'ed.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (str(file_path), st.st_mtime, st.st_size)
+
+
+SHARED_DIR_MODE = 0o2775  # group-writable, setgid so new entries keep the group
+
+
+def make_shared_dir(dir_path: Path):
+    """
+    Creates dir_path (and missing parents) writable by the whole group,
+    regardless of the creating user's umask.
+    """
+    missing = []
+    current = Path(dir_path)
+    while not current.exists():
+        missing.append(current)
+        current = current.parent
+    for d in reversed(missing):
+        try:
+            d.mkdir(mode=SHARED_DIR_MODE)
+        except FileExistsError:
+            # Another user created it meanwhile, their mode applies
+            continue
+        # mkdir's mode is filtered by the umask, chmod is not
+        os.chmod(str(d), SHARED_DIR_MODE)
+
+
+class DiskCache:
+    """
+    Small JSON cache on disk, one file per entry.
+
+    Entries are written atomically (temp file + rename), so several
+    sessions/users can share the same cache directory without locking.
+    Directories are created group-writable; users sharing the cache
+    must be in the cache directory's group.
+    """
+
+    def __init__(self, cache_dir: str, namespace: str):
+        self.cache_dir = Path(cache_dir) / namespace
+
+    def _entry_path(self, key: Sequence) -> Path:
+        digest = hashlib.sha1(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        # Fan out into sub-directories to keep directory listings short
+        return self.cache_dir / digest[:2] / (digest + ".json")
+
+    def get(self, key: Sequence) -> Optional[Any]:
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def put(self, key: Sequence, value: Any):
+        entry = self._entry_path(key)
+        tmp_path = None
+        try:
+            make_shared_dir(entry.parent)
+            fd, tmp_path = tempfile.mkstemp(dir=str(entry.parent), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            # Shared cache: let other users read/replace what we wrote
+            os.chmod(tmp_path, 0o664)
+            os.replace(tmp_path, str(entry))
+        except Exception:
+            # Cache is best-effort, never fail the caller
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
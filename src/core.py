@@ -1,9 +1,168 @@
 import os
+import gzip
+import filecmp
+import hashlib
 import subprocess
 import re
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TextIO, Iterator, Tuple
+
+
+def is_gzip(file_path: str) -> bool:
+    """
+    True if the file really is gzip-compressed.
+    Some "*.gz" logs are actually plain text.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(2) == b'\x1f\x8b'
+    except OSError:
+        return False
+
+
+def open_log(file_path: str) -> TextIO:
+    """
+    Opens a log for text reading, decompressing `.gz` logs on the fly.
+    """
+    if str(file_path).endswith(".gz") and is_gzip(file_path):
+        return gzip.open(file_path, 'rt', errors='ignore')
+    return open(file_path, 'r', errors='ignore')
+
+
+def classify_description(description: Optional[str]) -> Optional[str]:
+    """
+    Classifies an .mlnx description line as "pass", "fail" or None (unknown).
+    """
+    if not description:
+        return None
+    desc_lower = description.lower()
+    if "pass" in desc_lower:
+        return "pass"
+    if any(x in desc_lower for x in ["fail", "error", "timeout", "exception"]):
+        return "fail"
+    return None
+
+
+def _is_month(name: str) -> bool:
+    """True for two-digit months, "01" to "12"."""
+    return len(name) == 2 and name.isdigit() and 1 <= int(name) <= 12
+
+
+HASH_SAMPLE_SIZE = 64 * 1024
+
+
+def sampled_hash(file_path: str, size: int) -> Optional[str]:
+    """
+    Cheap content fingerprint: hashes the size plus the start, middle
+    and end of the file instead of reading all of it.
+    """
+    digest = hashlib.sha1(str(size).encode('ascii'))
+    try:
+        with open(file_path, 'rb') as f:
+            for offset in sorted({0, max(0, size // 2 - HASH_SAMPLE_SIZE // 2), max(0, size - HASH_SAMPLE_SIZE)}):
+                f.seek(offset)
+                digest.update(f.read(HASH_SAMPLE_SIZE))
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _same_contents(path_a: str, path_b: str) -> bool:
+    try:
+        return filecmp.cmp(path_a, path_b, shallow=False)
+    except OSError:
+        return False
+
+
+def group_duplicates(paths: List[str]) -> List[List[str]]:
+    """
+    Groups paths that refer to the same file: first by (st_dev, st_ino)
+    (same file or hard link), then by size plus sampled hash, confirmed by
+    a full comparison (copies).
+    Groups keep the order of first appearance; unreadable paths stay alone.
+    """
+    groups = []      # type: List[List[str]]
+    by_inode = {}    # (dev, ino) -> group index
+    by_size = {}     # size -> [(group index, path of the group)]
+    hashes = {}      # path -> sampled hash, computed lazily
+
+    def hash_of(path: str, size: int) -> Optional[str]:
+        if path not in hashes:
+            hashes[path] = sampled_hash(path, size)
+        return hashes[path]
+
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            groups.append([path])
+            continue
+
+        idx = by_inode.get((st.st_dev, st.st_ino))
+        if idx is None:
+            # Only hash when another file has the same size, and only trust
+            # the sampled hash once the full contents compare equal
+            for other_idx, other_path in by_size.get(st.st_size, []):
+                path_hash = hash_of(path, st.st_size)
+                if path_hash is not None and path_hash == hash_of(other_path, st.st_size) \
+                        and _same_contents(path, other_path):
+                    idx = other_idx
+                    break
+
+        if idx is None:
+            idx = len(groups)
+            groups.append([])
+            by_size.setdefault(st.st_size, []).append((idx, path))
+        by_inode[(st.st_dev, st.st_ino)] = idx
+        groups[idx].append(path)
+
+    return groups
+
+
+def content_hash(file_path: str) -> Optional[str]:
+    """Full-content SHA-1 of a file, for comparing logs across hosts."""
+    digest = hashlib.sha1()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def merge_log_entry(log: Dict, other: Dict):
+    """Folds a duplicate entry into `log`: locations, tags and description."""
+    locations = log.setdefault('locations', [log['path']])
+    for location in other.get('locations', [other['path']]):
+        if location not in locations:
+            locations.append(location)
+    if not log.get('description') and other.get('description'):
+        log['description'] = other['description']
+    for tag in other.get('tags', []):
+        if tag not in log.setdefault('tags', []):
+            log['tags'].append(tag)
+
+
+def dedupe_logs(logs: List[Dict]) -> List[Dict]:
+    """
+    Collapses log entries pointing at the same file into one entry,
+    keeping the first one and listing every path under 'locations'.
+    """
+    by_path = {}
+    for log in logs:
+        by_path.setdefault(log['path'], log)
+
+    unique = []
+    for group in group_duplicates(list(by_path)):
+        log = by_path[group[0]]
+        log['locations'] = [group[0]]
+        for other in group[1:]:
+            merge_log_entry(log, by_path[other])
+        unique.append(log)
+    return unique
+
 
 class ProductResolver:
     """
@@ -113,25 +272,24 @@ class LogSearcher:
         
         found_logs = []
         
-        # We'll search slightly more intelligently than hardcoded years, 
-        # but keep the structure expectation.
-        
         # We iterate provided roots (like /usr/flexfs/lion_cub/log/ft, etc)
+        for _, month_dir in self.iter_month_dirs(pn):
+            self._check_dir_for_logs(month_dir, pn, sn, found_logs)
+        
+        # The same log often shows up under several roots (e.g. ft and dbg/ft)
+        return dedupe_logs(found_logs)
+
+    def iter_month_dirs(self, pn: str) -> Iterator[Tuple[str, Path]]:
+        """
+        Yields ("YYYY-MM", month_dir) for every month directory of a PN
+        under all roots. Handles both PN/YYYY/MM and PN/YYYYMM layouts.
+        """
         for root in self.root_dirs:
             pn_dir = Path(root) / pn
             if not pn_dir.exists():
                 continue
 
-            # Instead of nested loops for years/months, let's walk the directory
-            # looking for the expected structure or just search recursively.
-            # Given the depth is fixed (Year/Month), we can glob.
-            
-            # Pattern: pn_dir / YYYY / MM / pn.mlnx
-            # or just use os.walk to find relevant files.
-            
-            # Try to handle both YYYY/MM and YYYYMM structures
             # Original script seemed to use YYYYMM (e.g. 202201)
-            
             for child in pn_dir.iterdir():
                 if not child.is_dir():
                     continue
@@ -139,14 +297,36 @@ class LogSearcher:
                 # Case 1: Child is YYYY (e.g. 2024) -> Look for MM inside
                 if child.name.isdigit() and len(child.name) == 4:
                      for month_dir in child.iterdir():
-                        if month_dir.is_dir():
-                            self._check_dir_for_logs(month_dir, pn, sn, found_logs)
+                        if month_dir.is_dir() and _is_month(month_dir.name):
+                            yield f"{child.name}-{month_dir.name}", month_dir
                 
                 # Case 2: Child is YYYYMM (e.g. 202401)
-                elif child.name.isdigit() and len(child.name) == 6:
-                    self._check_dir_for_logs(child, pn, sn, found_logs)
-        
-        return found_logs
+                elif child.name.isdigit() and len(child.name) == 6 and _is_month(child.name[4:]):
+                    yield f"{child.name[:4]}-{child.name[4:]}", child
+
+    def iter_log_files(self, pn: str) -> Iterator[Path]:
+        """
+        Yields every log file of a PN regardless of SN, applying the same
+        filters and DEBUG-over-parent preference as search().
+        """
+        for _, month_dir in self.iter_month_dirs(pn):
+            debug_names = set()
+            debug_dir = month_dir / "DEBUG"
+            try:
+                if debug_dir.exists():
+                    for f in debug_dir.iterdir():
+                        if f.is_file() and self._is_log_name(f.name):
+                            debug_names.add(f.name)
+                            yield f
+                for f in month_dir.iterdir():
+                    if f.is_file() and self._is_log_name(f.name) and f.name not in debug_names:
+                        yield f
+            except OSError:
+                continue
+
+    @staticmethod
+    def _is_log_name(name: str) -> bool:
+        return not (name.endswith(".mlnx") or "led" in name or "SUMMARY" in name)
 
     def _check_dir_for_logs(self, dir_path: Path, pn: str, sn: str, found_logs: List[Dict]):
         """Helper to check a specific directory (YYYYMM level) for index file and logs"""
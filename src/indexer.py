@@ -0,0 +1,324 @@
+import os
+import re
+import json
+import uuid
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no locking, concurrent builds of one PN are last-writer-wins
+    fcntl = None
+
+try:
+    from src.core import LogSearcher, open_log, group_duplicates
+    from src.cache import DiskCache, file_key, make_shared_dir
+    from src.summarizer import DEFAULT_SIGNATURES
+except ImportError:
+    from core import LogSearcher, open_log, group_duplicates
+    from cache import DiskCache, file_key, make_shared_dir
+    from summarizer import DEFAULT_SIGNATURES
+
+
+class _SegmentLock:
+    """Exclusive lock on a file, so only one build writes a segment at a time."""
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._fd = None
+
+    def __enter__(self):
+        # flock needs no write access: read-only works for every user
+        # of the shared cache, whoever created the lock file
+        self._fd = os.open(str(self.lock_path), os.O_RDONLY | os.O_CREAT, 0o664)
+        try:
+            # os.open's mode is filtered by the umask
+            os.fchmod(self._fd, 0o664)
+        except (OSError, AttributeError):
+            # Not our file (or Windows), leave its mode alone
+            pass
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+# First "letters followed by a digit" token of the file name, e.g. MT2301X12345
+DEFAULT_SN_PATTERN = r"[A-Z]+\d[A-Z0-9]*"
+
+# Bump when tokenizing or the on-disk format changes
+INDEX_VERSION = 3
+MIN_TOKEN_LEN = 3
+
+
+def normalize_line(line: str) -> str:
+    """Lowercases and masks numbers so the same error on any unit looks alike."""
+    line = re.sub(r"0x[0-9a-fA-F]+", "#", line.lower())
+    return re.sub(r"\d+", "#", line)
+
+
+def tokenize(line: str) -> List[str]:
+    # Punctuation ('.', '-', ':' ...) separates tokens: "mlxreg-fan." -> mlxreg, fan
+    tokens = re.findall(r"[a-z_][a-z0-9_#]*", normalize_line(line))
+    return [t for t in tokens if len(t) >= MIN_TOKEN_LEN]
+
+
+def _encode_varints(values: Iterable[int], out: bytearray):
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+
+
+def _decode_varints(data: bytes) -> List[int]:
+    values = []
+    v = shift = 0
+    for b in data:
+        v |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+        else:
+            values.append(v)
+            v = shift = 0
+    return values
+
+
+def _extract_tokens(file_path: str, signatures: List[str]) -> Optional[Dict[str, List[int]]]:
+    """
+    Worker: returns {token: [line numbers]} for the error lines of one log.
+    Module level so it can run in a process pool.
+    """
+    signature_res = [re.compile(s, re.IGNORECASE) for s in signatures]
+    postings = {}
+    try:
+        with open_log(file_path) as f:
+            for line_no, line in enumerate(f, 1):
+                if not any(r.search(line) for r in signature_res):
+                    continue
+                for token in set(tokenize(line)):
+                    postings.setdefault(token, []).append(line_no)
+    except Exception:
+        return None
+    return postings
+
+
+class ContentIndex:
+    """
+    Opt-in inverted index of error lines across all logs of a PN.
+
+    Each PN is a separate segment: a JSON manifest (documents + term
+    dictionary) pointing at a binary file of varint, delta-encoded
+    posting lists:
+
+        per term:  doc_delta, n_lines, line_delta, line_delta, ...
+
+    Building a PN only rewrites that PN's segment, under a per-segment lock,
+    so users indexing different PNs never overwrite each other. Per-log
+    token extraction is cached by (path, mtime, size), so rebuilding only
+    decompresses new or changed logs, and an unchanged PN is not rewritten.
+    """
+
+    def __init__(self, index_dir: str, signatures: Optional[List[str]] = None,
+                 sn_pattern: str = DEFAULT_SN_PATTERN, workers: Optional[int] = None):
+        self.index_dir = Path(index_dir)
+        self.signatures = list(signatures) if signatures else list(DEFAULT_SIGNATURES)
+        self.sn_re = re.compile(sn_pattern)
+        self.workers = workers
+        self.extract_cache = DiskCache(str(self.index_dir), "extracted")
+        self.extracted = 0  # Logs actually read (cache misses) in the last build
+
+    @property
+    def segments_dir(self) -> Path:
+        return self.index_dir / "segments"
+
+    def _segment_dir(self, pn: str) -> Path:
+        # PNs become directory names: keep them readable but never path-like
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", pn)
+        return self.segments_dir / f"{safe}-{hashlib.sha1(pn.encode('utf-8')).hexdigest()[:8]}"
+
+    def build(self, searcher: LogSearcher, pns: List[str]):
+        """
+        (Re)indexes every log of the given PNs. Other PNs are untouched.
+        """
+        self.extracted = 0
+        for pn in pns:
+            docs = []
+            # Index each unique file once, whichever roots it appears under
+            paths = [str(f) for f in searcher.iter_log_files(pn)]
+            for group in group_duplicates(paths):
+                key = file_key(group[0])
+                if key is not None:
+                    docs.append({"pn": pn, "sn": self._sn_of(Path(group[0]).name),
+                                 "key": list(key), "locations": group})
+
+            segment = self._segment_dir(pn)
+            make_shared_dir(segment)
+            with _SegmentLock(segment / "lock"):
+                old = self._load_manifest(segment)
+                if old and old["signatures"] == self.signatures and old["docs"] == docs:
+                    continue
+                self._write(segment, docs, self._extract_all([d["key"] for d in docs]), old)
+
+    def query(self, text: str) -> List[Dict]:
+        """
+        Returns logs having at least one error line containing all tokens
+        of `text`, as {"sn", "path", "pn", "lines", "locations"} sorted by SN.
+        """
+        tokens = set(tokenize(text))
+        if not tokens or not self.segments_dir.is_dir():
+            return []
+
+        results = []
+        for segment in sorted(self.segments_dir.iterdir()):
+            results.extend(self._query_segment(segment, tokens))
+        results.sort(key=lambda r: (r["sn"] or "", r["path"]))
+        return results
+
+    def _query_segment(self, segment: Path, tokens: set) -> List[Dict]:
+        # A concurrent build may replace the postings file between reading
+        # the manifest and opening it: re-read the manifest once
+        for _ in range(2):
+            manifest = self._load_manifest(segment)
+            if not manifest or not manifest["docs"]:
+                return []
+            try:
+                matches = self._match(segment / manifest["postings"], manifest["terms"], tokens)
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            return []
+
+        results = []
+        for doc_id, lines in matches.items():
+            doc = manifest["docs"][doc_id]
+            results.append({"sn": doc["sn"], "pn": doc["pn"], "path": doc["key"][0],
+                            "lines": sorted(lines), "locations": doc["locations"]})
+        return results
+
+    def _match(self, postings_path: Path, terms: Dict, tokens: set) -> Dict[int, set]:
+        matches = None  # doc id -> set of line numbers
+        with open(postings_path, 'rb') as f:
+            for token in tokens:
+                entry = terms.get(token)
+                if entry is None:
+                    return {}
+                f.seek(entry[0])
+                postings = self._decode_postings(f.read(entry[1]))
+                if matches is None:
+                    matches = postings
+                else:
+                    matches = {d: matches[d] & lines for d, lines in postings.items()
+                               if d in matches and matches[d] & lines}
+                if not matches:
+                    return {}
+        return matches
+
+    def _sn_of(self, name: str) -> Optional[str]:
+        match = self.sn_re.search(name)
+        return match.group(0) if match else None
+
+    def _extract_all(self, keys: List[List]) -> List[Dict[str, List[int]]]:
+        results = [None] * len(keys)
+        todo = []
+        for i, key in enumerate(keys):
+            cached = self.extract_cache.get(key + [self.signatures, INDEX_VERSION])
+            if cached is not None:
+                results[i] = cached
+            else:
+                todo.append(i)
+
+        if todo:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                extracted = pool.map(_extract_tokens, [keys[i][0] for i in todo],
+                                     [self.signatures] * len(todo), chunksize=8)
+                for i, tokens in zip(todo, extracted):
+                    self.extracted += 1
+                    if tokens is None:
+                        tokens = {}
+                    else:
+                        self.extract_cache.put(keys[i] + [self.signatures, INDEX_VERSION], tokens)
+                    results[i] = tokens
+        return results
+
+    def _write(self, segment: Path, docs: List[Dict], tokens_per_doc: List[Dict[str, List[int]]],
+               old_manifest: Optional[Dict]):
+        # Invert: term -> [(doc_id, lines)], doc ids ascending
+        inverted = {}
+        for doc_id, tokens in enumerate(tokens_per_doc):
+            for token, lines in tokens.items():
+                inverted.setdefault(token, []).append((doc_id, lines))
+
+        blob = bytearray()
+        terms = {}
+        for token in sorted(inverted):
+            start = len(blob)
+            prev_doc = 0
+            for doc_id, lines in inverted[token]:
+                _encode_varints((doc_id - prev_doc, len(lines)), blob)
+                prev_line = 0
+                for line in lines:
+                    _encode_varints((line - prev_line,), blob)
+                    prev_line = line
+                prev_doc = doc_id
+            terms[token] = [start, len(blob) - start]
+
+        # New postings file first, then swap the manifest atomically,
+        # so readers always see a consistent pair
+        postings_name = f"postings-{uuid.uuid4().hex}.bin"
+        with open(segment / postings_name, 'wb') as f:
+            f.write(blob)
+        manifest = {"version": INDEX_VERSION, "signatures": self.signatures,
+                    "docs": docs, "terms": terms, "postings": postings_name}
+        tmp_path = segment / (postings_name + ".manifest.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        for written in (segment / postings_name, tmp_path):
+            # Shared index: other users rebuild this segment too
+            os.chmod(str(written), 0o664)
+        os.replace(str(tmp_path), str(segment / "manifest.json"))
+
+        # Readers still holding the old manifest retry with the new one
+        if old_manifest and old_manifest["postings"] != postings_name:
+            try:
+                os.remove(str(segment / old_manifest["postings"]))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _load_manifest(segment: Path) -> Optional[Dict]:
+        try:
+            with open(segment / "manifest.json", 'r') as f:
+                manifest = json.load(f)
+        except Exception:
+            return None
+        if manifest.get("version") != INDEX_VERSION:
+            return None
+        return manifest
+
+    @staticmethod
+    def _decode_postings(data: bytes) -> Dict[int, set]:
+        values = _decode_varints(data)
+        postings = {}
+        i = 0
+        doc_id = 0
+        while i < len(values):
+            doc_id += values[i]
+            n_lines = values[i + 1]
+            i += 2
+            lines = set()
+            line = 0
+            for delta in values[i:i + n_lines]:
+                line += delta
+                lines.add(line)
+            i += n_lines
+            postings[doc_id] = lines
+        return postings
@@ -3,6 +3,11 @@ import os
 from subprocess import call
 from typing import List, Dict
 
+try:
+    from src.core import classify_description
+except ImportError:
+    from core import classify_description
+
 class Colors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -40,22 +45,66 @@ def display_results(logs: List[Dict[str, str]]):
 
         # Determine text color based on description
         name_color = Colors.OKBLUE # Default neutral
-        if log.get('description'):
-            desc_lower = log['description'].lower()
-            if "pass" in desc_lower:
-                name_color = Colors.OKGREEN
-            elif any(x in desc_lower for x in ["fail", "error", "timeout", "exception"]):
-                name_color = Colors.FAIL
+        status = classify_description(log.get('description'))
+        if status == "pass":
+            name_color = Colors.OKGREEN
+        elif status == "fail":
+            name_color = Colors.FAIL
 
         print(f"{Colors.BOLD}[{idx}]{Colors.ENDC} {tags_str}{name_color}{log['name']}{Colors.ENDC}")
         print(f"    {Colors.WARNING}Path:{Colors.ENDC} {log['path']}")
+        for other in log.get('locations', [])[1:]:
+            print(f"    {Colors.WARNING}Also:{Colors.ENDC} {other}")
         
         if log.get('description'):
             print(f"    {Colors.OKBLUE}Info:{Colors.ENDC} {log['description']}")
+
+        summary = log.get('summary')
+        if summary and summary.get('status') == 'fail':
+            step_str = f" at step {summary['step']}" if summary.get('step') else ""
+            print(f"    {Colors.FAIL}Failed{step_str} (line {summary['line']}):{Colors.ENDC}")
+            for line in summary.get('excerpt', []):
+                print(f"      {line}")
         
         # Add a separator blank line
         print()
 
+def display_stats(pn: str, months: Dict[str, Dict], top_failures: List):
+    if not months:
+        print(f"\n{Colors.WARNING}No .mlnx data found for {pn}.{Colors.ENDC}\n")
+        return
+
+    print(f"\n{Colors.UNDERLINE}Yield for {pn}:{Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Month':<9}{'Pass':>8}{'Fail':>8}{'Other':>8}{'Yield':>9}{Colors.ENDC}")
+    for month, rollup in months.items():
+        tested = rollup['pass'] + rollup['fail']
+        yield_str = f"{100.0 * rollup['pass'] / tested:.1f}%" if tested else "-"
+        print(f"{month:<9}{Colors.OKGREEN}{rollup['pass']:>8}{Colors.ENDC}"
+              f"{Colors.FAIL}{rollup['fail']:>8}{Colors.ENDC}{rollup['other']:>8}{yield_str:>9}")
+
+    if top_failures:
+        print(f"\n{Colors.UNDERLINE}Top failures:{Colors.ENDC}")
+        for desc, count in top_failures:
+            print(f"{Colors.FAIL}{count:>6}{Colors.ENDC}  {desc}")
+    print()
+
+def display_matches(query: str, matches: List[Dict]):
+    if not matches:
+        print(f"\n{Colors.WARNING}No indexed logs match '{query}'.{Colors.ENDC}\n")
+        return
+
+    sns = sorted({m['sn'] or '?' for m in matches})
+    print(f"\n{Colors.UNDERLINE}'{query}' found in {len(matches)} logs of {len(sns)} units:{Colors.ENDC}")
+    for match in matches:
+        lines_str = ", ".join(str(l) for l in match['lines'][:10])
+        if len(match['lines']) > 10:
+            lines_str += ", ..."
+        print(f"{Colors.BOLD}{match['sn'] or '?'}{Colors.ENDC} ({match['pn']}) {match['path']}")
+        for other in match.get('locations', [])[1:]:
+            print(f"    {Colors.WARNING}Also:{Colors.ENDC} {other}")
+        print(f"    {Colors.WARNING}Lines:{Colors.ENDC} {lines_str}")
+    print()
+
 def select_log(logs: List[Dict[str, str]]) -> int:
     while True:
         try:
@@ -73,11 +122,17 @@ def select_log(logs: List[Dict[str, str]]) -> int:
         except ValueError:
             print(f"{Colors.FAIL}Please enter a number.{Colors.ENDC}")
 
-def view_file(filepath: str):
+def view_file(filepath: str, prefetcher=None):
     """
     Opens file in 'less' or suitable viewer.
+    Uses the prefetched local copy when one is ready.
     """
     print_header(f"Opening {filepath}")
+
+    if prefetcher:
+        local_path = prefetcher.local_path(filepath)
+        if local_path:
+            filepath = local_path
     
     # Check if 'less' is available (common on Linux)
     try:
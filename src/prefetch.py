@@ -0,0 +1,172 @@
+import os
+import gzip
+import json
+import queue
+import stat
+import hashlib
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from src.core import is_gzip
+    from src.cache import file_key
+except ImportError:
+    from core import is_gzip
+    from cache import file_key
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+# Partial copies untouched for this long belong to a session that is gone
+STALE_TMP_SECONDS = 10 * 60
+
+
+class LogPrefetcher:
+    """
+    Reads ahead and decompresses logs into a size-capped local cache
+    while the operator is still looking at the list. The cache directory
+    must be private to the current user (PermissionError otherwise).
+
+    Cached copies are keyed by (path, mtime, size); a copy is only visible
+    once fully written. Least recently used copies are evicted first.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, workers: int = 2):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._ensure_private_dir()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        for _ in range(workers):
+            # Daemon threads: never hold up exiting the program
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def prefetch(self, paths: List[str]):
+        """Replaces whatever is still pending with `paths` (in order)."""
+        try:
+            while True:
+                self._queue.get_nowait()
+                self._queue.task_done()
+        except queue.Empty:
+            pass
+        for path in paths:
+            self._queue.put(path)
+
+    def wait(self):
+        """Blocks until everything queued has been fetched."""
+        self._queue.join()
+
+    def local_path(self, path: str) -> Optional[str]:
+        """Returns the local decompressed copy of `path` if it is ready."""
+        key = file_key(path)
+        if key is None:
+            return None
+        local = self._entry_path(key)
+        try:
+            # Mark as recently used
+            os.utime(str(local), None)
+        except OSError:
+            return None
+        return str(local)
+
+    def _ensure_private_dir(self):
+        """
+        Cached copies are opened in place of the real logs, so the directory
+        must be ours alone: otherwise anyone could plant a fake copy.
+        """
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(str(self.cache_dir))
+        if not stat.S_ISDIR(st.st_mode):
+            raise PermissionError(f"Prefetch cache {self.cache_dir} is not a directory")
+        if hasattr(os, "getuid"):
+            if st.st_uid != os.getuid():
+                raise PermissionError(f"Prefetch cache {self.cache_dir} is owned by another user")
+            if st.st_mode & 0o077:
+                raise PermissionError(f"Prefetch cache {self.cache_dir} is accessible by other users")
+        self._remove_stale_tmp()
+
+    def _entry_path(self, key) -> Path:
+        digest = hashlib.sha1(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        return self.cache_dir / (digest + ".log")
+
+    def _worker(self):
+        while True:
+            path = self._queue.get()
+            try:
+                self._fetch(path)
+            except Exception:
+                # Prefetching is best-effort; view_file falls back to the original
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _fetch(self, path: str):
+        key = file_key(path)
+        if key is None:
+            return
+        local = self._entry_path(key)
+        if local.exists():
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+        try:
+            opener = gzip.open if is_gzip(path) else open
+            with opener(path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                written = 0
+                for chunk in iter(lambda: src.read(COPY_CHUNK_SIZE), b''):
+                    written += len(chunk)
+                    if written > self.max_bytes:
+                        # Would never fit the cache, stop decompressing now
+                        return
+                    dst.write(chunk)
+            os.replace(tmp_path, str(local))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._evict()
+
+    def _remove_stale_tmp(self):
+        """
+        Removes partial copies left behind when the program exited in the
+        middle of a fetch (workers are daemon threads, nothing cleans up).
+        """
+        now = time.time()
+        for f in self.cache_dir.glob("*.tmp"):
+            try:
+                if now - f.stat().st_mtime > STALE_TMP_SECONDS:
+                    f.unlink()
+            except OSError:
+                pass
+
+    def _evict(self):
+        with self._lock:
+            self._remove_stale_tmp()
+
+            # Copies still being written count toward the cap too
+            in_progress = 0
+            for f in self.cache_dir.glob("*.tmp"):
+                try:
+                    in_progress += f.stat().st_size
+                except OSError:
+                    pass
+
+            entries = []
+            for f in self.cache_dir.glob("*.log"):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, f))
+
+            total = in_progress + sum(size for _, size, _ in entries)
+            for _, size, f in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    f.unlink()
+                    total -= size
+                except OSError:
+                    pass
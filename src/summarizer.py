@@ -0,0 +1,111 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+try:
+    from src.core import open_log
+    from src.cache import DiskCache, file_key
+except ImportError:
+    from core import open_log
+    from cache import DiskCache, file_key
+
+
+# Lines that mark a log as failed (case-insensitive regexes)
+DEFAULT_SIGNATURES = [
+    r"\bFAIL(?:ED|URE)?\b",
+    r"\bERROR\b",
+    r"Traceback \(most recent call last\)",
+    r"\bTIME ?OUT\b|\bTIMED OUT\b",
+    r"\bEXCEPTION\b",
+]
+
+# Lines that announce the step/test currently running, e.g. "STEP: fan_test"
+DEFAULT_STEP_PATTERN = r"^\s*(?:STEP|TEST)\b\s*[:#-]\s*(\S.*)"
+
+EXCERPT_CONTEXT = 2      # Lines kept before the failing line
+EXCERPT_MAX_CHARS = 160  # Per excerpt line
+
+
+class LogSummarizer:
+    """
+    Scans logs for failure signatures and extracts the first failing step
+    plus a short excerpt around the first hit.
+
+    Summaries are cached by (path, mtime, size), so each log is read once
+    no matter how many sessions ask for it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 signatures: Optional[List[str]] = None,
+                 step_pattern: str = DEFAULT_STEP_PATTERN,
+                 workers: int = 8):
+        self.signatures = list(signatures) if signatures else list(DEFAULT_SIGNATURES)
+        self.step_pattern = step_pattern
+        self.workers = workers
+        self._signature_res = [re.compile(s, re.IGNORECASE) for s in self.signatures]
+        self._step_re = re.compile(step_pattern, re.IGNORECASE)
+        self.cache = DiskCache(cache_dir, "summaries") if cache_dir else None
+
+    def summarize_all(self, logs: List[Dict]) -> List[Dict]:
+        """
+        Summarizes every log in parallel and stores the result
+        under the 'summary' key of each log entry.
+        """
+        if not logs:
+            return logs
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            summaries = list(pool.map(lambda log: self.summarize(log['path']), logs))
+        for log, summary in zip(logs, summaries):
+            log['summary'] = summary
+        return logs
+
+    def summarize(self, file_path: str) -> Optional[Dict]:
+        """Returns the (possibly cached) summary of a single log."""
+        key = file_key(file_path)
+        if key is None:
+            return None
+
+        # Signatures are part of the key: changing them invalidates old entries
+        cache_key = list(key) + [self.signatures, self.step_pattern]
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        summary = self._scan(file_path)
+        if summary is not None and self.cache:
+            self.cache.put(cache_key, summary)
+        return summary
+
+    def _scan(self, file_path: str) -> Optional[Dict]:
+        current_step = None
+        recent = []
+        try:
+            with open_log(file_path) as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.rstrip()
+
+                    # Checked before the step pattern: the failing line itself
+                    # must not become the step
+                    for signature, signature_re in zip(self.signatures, self._signature_res):
+                        if signature_re.search(line):
+                            excerpt = recent + [line]
+                            return {
+                                "status": "fail",
+                                "signature": signature,
+                                "step": current_step,
+                                "line": line_no,
+                                "excerpt": [l[:EXCERPT_MAX_CHARS] for l in excerpt],
+                            }
+
+                    step_match = self._step_re.search(line)
+                    if step_match:
+                        current_step = step_match.group(1).strip()
+
+                    recent.append(line)
+                    if len(recent) > EXCERPT_CONTEXT:
+                        recent.pop(0)
+        except Exception:
+            return None
+
+        return {"status": "clean", "signature": None, "step": None, "line": None, "excerpt": []}
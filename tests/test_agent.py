@@ -0,0 +1,150 @@
+import unittest
+import tempfile
+import shutil
+import socket
+import subprocess
+import re
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.agent import AgentAggregator
+
+MAIN = str(Path(__file__).parent.parent / "main.py")
+
+class TestAgentAggregator(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.pn = "S777"
+        self.sn = "SN777"
+        self.agents = []
+
+        # One agent process per root, like one per file server
+        for name in ("server_a", "server_b"):
+            month_dir = Path(self.test_dir) / name / self.pn / "2024" / "03"
+            (month_dir / "DEBUG").mkdir(parents=True)
+            (month_dir / f"{self.pn}.mlnx").write_text(f"{self.sn} PASS\n")
+            (month_dir / "DEBUG" / f"{name}_{self.sn}.gz").write_text(f"log from {name}\n")
+            # The same log mirrored on both servers
+            (month_dir / "DEBUG" / f"shared_{self.sn}.gz").write_text("shared log\n")
+            # Same size, start, middle and end, but different content
+            content = bytearray(b"x" * 300 * 1024)
+            if name == "server_b":
+                content[90 * 1024] = ord("y")
+            (month_dir / "DEBUG" / f"lookalike_{self.sn}.gz").write_bytes(bytes(content))
+
+            proc = subprocess.Popen(
+                [sys.executable, "-u", MAIN, "--serve", "--host", "127.0.0.1", "--port", "0",
+                 "--path", str(Path(self.test_dir) / name),
+                 "--cache-dir", str(Path(self.test_dir) / "cache")],
+                stdout=subprocess.PIPE, universal_newlines=True)
+            self.agents.append(proc)
+
+        self.addresses = []
+        for proc in self.agents:
+            for line in proc.stdout:
+                match = re.search(r"listening on (\S+:\d+)", line)
+                if match:
+                    self.addresses.append(match.group(1))
+                    break
+
+    def tearDown(self):
+        for proc in self.agents:
+            proc.terminate()
+            proc.wait()
+            proc.stdout.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_merges_results_from_all_agents(self):
+        aggregator = AgentAggregator(self.addresses, timeout=10)
+        results = aggregator.search(self.pn, self.sn)
+        names = sorted(r['name'] for r in results)
+        self.assertEqual(names, [f"lookalike_{self.sn}.gz", f"lookalike_{self.sn}.gz",
+                                 f"server_a_{self.sn}.gz", f"server_b_{self.sn}.gz", f"shared_{self.sn}.gz"])
+        self.assertEqual(aggregator.errors, {})
+
+    def test_duplicates_across_agents_are_collapsed(self):
+        results = AgentAggregator(self.addresses, timeout=10).search(self.pn, self.sn)
+        shared = [r for r in results if r['name'].startswith("shared_")]
+        self.assertEqual(len(shared), 1)
+        self.assertEqual(len(shared[0]['locations']), 2)
+        # Full hashes were only needed for the colliding entries, and are cached
+        cached = list((Path(self.test_dir) / "cache" / "content_hashes").rglob("*.json"))
+        self.assertEqual(len(cached), 4)
+
+    def test_hash_only_for_logs_under_roots(self):
+        outside = Path(self.test_dir) / "secret.txt"
+        outside.write_text("secret")
+        for path in (str(outside), str(Path(self.test_dir) / "server_a" / ".." / "secret.txt")):
+            query = urllib.parse.urlencode({"path": path})
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(f"http://{self.addresses[0]}/hash?{query}", timeout=10)
+            self.assertEqual(ctx.exception.code, 404)
+            ctx.exception.close()
+
+    def test_rejects_path_like_queries(self):
+        for pn, sn in (("..", self.sn), (f"../server_b/{self.pn}", self.sn), ("/etc", self.sn), (self.pn, "a/b")):
+            query = urllib.parse.urlencode({"pn": pn, "sn": sn})
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(f"http://{self.addresses[0]}/search?{query}", timeout=10)
+            self.assertEqual(ctx.exception.code, 400)
+            ctx.exception.close()
+
+    def test_tolerates_missing_agent(self):
+        # Grab a port nobody listens on
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            dead = f"127.0.0.1:{s.getsockname()[1]}"
+
+        aggregator = AgentAggregator(self.addresses + [dead], timeout=10)
+        results = aggregator.search(self.pn, self.sn)
+        self.assertEqual(len(results), 5)
+        self.assertIn(f"http://{dead}", aggregator.errors)
+
+    def test_tolerates_slow_agent(self):
+        # Accepts connections but never answers
+        with socket.socket() as slow:
+            slow.bind(("127.0.0.1", 0))
+            slow.listen(1)
+            slow_addr = f"127.0.0.1:{slow.getsockname()[1]}"
+
+            aggregator = AgentAggregator(self.addresses + [slow_addr], timeout=1)
+            results = aggregator.search(self.pn, self.sn)
+            self.assertEqual(len(results), 5)
+            self.assertIn(f"http://{slow_addr}", aggregator.errors)
+
+    def test_keeps_results_streamed_before_deadline(self):
+        # Streams one entry, then stalls like an agent stuck on a slow root
+        stalled = socket.socket()
+        stalled.bind(("127.0.0.1", 0))
+        stalled.listen(1)
+        release = threading.Event()
+
+        def serve():
+            conn, _ = stalled.accept()
+            conn.recv(65536)
+            conn.sendall(b"HTTP/1.0 200 OK\r\nContent-Type: application/x-ndjson\r\n\r\n")
+            conn.sendall(json.dumps({"name": "early.gz", "path": "/x/early.gz", "date": 0}).encode() + b"\n")
+            release.wait(10)
+            conn.close()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        try:
+            address = f"127.0.0.1:{stalled.getsockname()[1]}"
+            aggregator = AgentAggregator([address], timeout=1)
+            results = aggregator.search(self.pn, self.sn)
+            self.assertEqual([r['name'] for r in results], ["early.gz"])
+            self.assertIn(f"http://{address}", aggregator.errors)
+        finally:
+            release.set()
+            thread.join()
+            stalled.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import shutil
+import os
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analytics import YieldAnalyzer
+
+class TestYieldAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir) / "logs"
+        self.cache_dir = str(Path(self.test_dir) / "cache")
+        self.pn = "S900"
+
+        jan = self.root / self.pn / "2024" / "01"
+        jan.mkdir(parents=True)
+        (jan / f"{self.pn}.mlnx").write_text(
+            "SN001 PASS\nSN002 FAIL fan 12 rpm\nSN003 FAIL fan 7 rpm\nSN004 PASS\n")
+
+        # YYYYMM layout for the second month
+        self.feb = self.root / self.pn / "202402"
+        self.feb.mkdir(parents=True)
+        (self.feb / f"{self.pn}.mlnx").write_text("SN005 PASS\nSN006 ERROR i2c timeout\n")
+
+        old = self.root / self.pn / "2023" / "12"
+        old.mkdir(parents=True)
+        (old / f"{self.pn}.mlnx").write_text("SN000 PASS\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_monthly_counts(self):
+        months = YieldAnalyzer([str(self.root)]).report(self.pn, since="2024-01")
+        self.assertEqual(list(months), ["2024-01", "2024-02"])
+        self.assertEqual(months["2024-01"]["pass"], 2)
+        self.assertEqual(months["2024-01"]["fail"], 2)
+        self.assertEqual(months["2024-02"]["fail"], 1)
+
+    def test_top_failures_are_normalized(self):
+        months = YieldAnalyzer([str(self.root)]).report(self.pn)
+        top = YieldAnalyzer.top_failures(months)
+        self.assertEqual(top[0], ("SN# FAIL fan # rpm", 2))
+
+    def test_only_changed_months_are_reparsed(self):
+        YieldAnalyzer([str(self.root)], cache_dir=self.cache_dir).report(self.pn)
+
+        analyzer = YieldAnalyzer([str(self.root)], cache_dir=self.cache_dir)
+        analyzer.report(self.pn)
+        self.assertEqual(analyzer.parsed_months, 0)
+
+        mlnx = self.feb / f"{self.pn}.mlnx"
+        with open(mlnx, 'a') as f:
+            f.write("SN007 PASS\n")
+        os.utime(mlnx, (1, 1))
+
+        months = analyzer.report(self.pn)
+        self.assertEqual(analyzer.parsed_months, 1)
+        self.assertEqual(months["2024-02"]["pass"], 2)
+
+    def test_duplicate_mlnx_counts_once(self):
+        # Same month mirrored under a second root (like log/ft and log/dbg/ft)
+        mirror = Path(self.test_dir) / "mirror"
+        mirror_jan = mirror / self.pn / "2024" / "01"
+        mirror_jan.mkdir(parents=True)
+        shutil.copy(str(self.root / self.pn / "2024" / "01" / f"{self.pn}.mlnx"), str(mirror_jan))
+
+        months = YieldAnalyzer([str(self.root), str(mirror)]).report(self.pn, since="2024-01", until="2024-01")
+        self.assertEqual(months["2024-01"]["pass"], 2)
+        self.assertEqual(months["2024-01"]["fail"], 2)
+
+    def test_ignores_non_month_dirs(self):
+        for name in ("old", "13", "1"):
+            junk = self.root / self.pn / "2024" / name
+            junk.mkdir()
+            (junk / f"{self.pn}.mlnx").write_text("SN999 PASS\n")
+
+        months = YieldAnalyzer([str(self.root)]).report(self.pn)
+        self.assertEqual(list(months), ["2023-12", "2024-01", "2024-02"])
+
+if __name__ == '__main__':
+    unittest.main()
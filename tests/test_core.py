@@ -59,5 +59,66 @@ class TestLogSearcher(unittest.TestCase):
         results = searcher.search(self.pn, "WRONGSN")
         self.assertEqual(len(results), 0)
 
+class TestDuplicateLogs(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        self.pn = "S12345"
+        self.sn = "SN123"
+
+        # Same month under two roots, like log/ft and log/dbg/ft
+        self.roots = [self.root / "ft", self.root / "dbg" / "ft"]
+        for root in self.roots:
+            debug_dir = root / self.pn / "2024" / "01" / "DEBUG"
+            debug_dir.mkdir(parents=True)
+            (debug_dir.parent / f"{self.pn}.mlnx").write_text(f"{self.sn} PASS\n")
+
+        self.debug_dirs = [root / self.pn / "2024" / "01" / "DEBUG" for root in self.roots]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _search(self):
+        return LogSearcher([str(r) for r in self.roots]).search(self.pn, self.sn)
+
+    def test_copies_are_collapsed(self):
+        for debug_dir in self.debug_dirs:
+            (debug_dir / f"log_{self.sn}.gz").write_text("same content")
+
+        results = self._search()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(results[0]['locations']), 2)
+        self.assertIn("DEBUG", results[0]['tags'])
+
+    def test_hard_links_are_collapsed(self):
+        original = self.debug_dirs[0] / f"log_{self.sn}.gz"
+        original.write_text("content")
+        try:
+            os.link(str(original), str(self.debug_dirs[1] / f"renamed_{self.sn}.gz"))
+        except (OSError, AttributeError):
+            self.skipTest("hard links not supported")
+
+        results = self._search()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(results[0]['locations']), 2)
+
+    def test_different_content_is_kept(self):
+        (self.debug_dirs[0] / f"log_{self.sn}.gz").write_text("content A")
+        (self.debug_dirs[1] / f"log_{self.sn}.gz").write_text("content B")
+
+        results = self._search()
+        self.assertEqual(len(results), 2)
+        self.assertEqual([len(r['locations']) for r in results], [1, 1])
+
+    def test_same_samples_but_different_content_is_kept(self):
+        # 300 KB files whose start, middle and end 64 KB match
+        content = bytearray(b"x" * 300 * 1024)
+        (self.debug_dirs[0] / f"log_{self.sn}.gz").write_bytes(bytes(content))
+        content[90 * 1024] = ord("y")
+        (self.debug_dirs[1] / f"log_{self.sn}.gz").write_bytes(bytes(content))
+
+        results = self._search()
+        self.assertEqual(len(results), 2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import tempfile
+import shutil
+import gzip
+import os
+import stat
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.core import LogSearcher
+from src.indexer import ContentIndex
+
+class TestContentIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir) / "logs"
+        self.index_dir = str(Path(self.test_dir) / "index")
+        self.pn = "S321"
+
+        self.debug_dir = self.root / self.pn / "2024" / "05" / "DEBUG"
+        self.debug_dir.mkdir(parents=True)
+        self._write_log("ft_MT001.gz", "start\nERROR: i2c bus 3 timeout on port 7\nend\n")
+        self._write_log("ft_MT002.gz", "start\nok\nERROR: i2c bus 1 timeout on port 2\n")
+        self._write_log("ft_MT003.gz", "start\nERROR: fan 2 stuck\n")
+        # Not an error line, must not be indexed
+        self._write_log("ft_MT004.gz", "i2c bus 1 check ok\n")
+
+        self.searcher = LogSearcher([str(self.root)])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_log(self, name: str, content: str):
+        with gzip.open(self.debug_dir / name, 'wt') as f:
+            f.write(content)
+
+    def test_query_returns_matching_units(self):
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+
+        matches = ContentIndex(self.index_dir).query("i2c bus 5 timeout")
+        self.assertEqual([m['sn'] for m in matches], ["MT001", "MT002"])
+        self.assertEqual(matches[0]['lines'], [2])
+        self.assertEqual(matches[1]['lines'], [3])
+
+    def test_punctuation_splits_tokens(self):
+        self._write_log("ft_MT005.gz", "ERROR: mlxreg-fan: i2c bus 4 timeout.\n")
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+
+        self.assertEqual([m['sn'] for m in index.query("i2c timeout")], ["MT001", "MT002", "MT005"])
+        self.assertEqual([m['sn'] for m in index.query("fan")], ["MT003", "MT005"])
+        self.assertEqual([m['sn'] for m in index.query("mlxreg-fan")], ["MT005"])
+
+    def test_all_tokens_must_be_on_one_line(self):
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+        self.assertEqual(index.query("i2c stuck"), [])
+
+    def test_rebuild_only_reads_changed_logs(self):
+        ContentIndex(self.index_dir, workers=2).build(self.searcher, [self.pn])
+
+        self._write_log("ft_MT003.gz", "ERROR: i2c bus 9 timeout\n")
+        os.utime(self.debug_dir / "ft_MT003.gz", (1, 1))
+
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+        self.assertEqual(index.extracted, 1)
+        self.assertEqual([m['sn'] for m in index.query("i2c timeout")], ["MT001", "MT002", "MT003"])
+
+    def test_duplicates_are_indexed_once(self):
+        other_root = Path(self.test_dir) / "dbg"
+        other_debug = other_root / self.pn / "2024" / "05" / "DEBUG"
+        other_debug.mkdir(parents=True)
+        shutil.copy(str(self.debug_dir / "ft_MT001.gz"), str(other_debug / "ft_MT001.gz"))
+
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(LogSearcher([str(self.root), str(other_root)]), [self.pn])
+        self.assertEqual(index.extracted, 4)
+
+        matches = index.query("i2c timeout")
+        self.assertEqual([m['sn'] for m in matches], ["MT001", "MT002"])
+        self.assertEqual(len(matches[0]['locations']), 2)
+
+    def test_builds_of_other_pns_are_kept(self):
+        other_debug = self.root / "S654" / "2024" / "05" / "DEBUG"
+        other_debug.mkdir(parents=True)
+        with gzip.open(other_debug / "ft_MT900.gz", 'wt') as f:
+            f.write("ERROR: i2c bus 2 timeout\n")
+
+        # Each PN is its own segment: building one never drops the other
+        first = ContentIndex(self.index_dir, workers=2)
+        second = ContentIndex(self.index_dir, workers=2)
+        first.build(self.searcher, [self.pn])
+        second.build(self.searcher, ["S654"])
+
+        matches = ContentIndex(self.index_dir).query("i2c timeout")
+        self.assertEqual([m['sn'] for m in matches], ["MT001", "MT002", "MT900"])
+
+    def test_lock_file_is_group_writable(self):
+        old_umask = os.umask(0o022)
+        try:
+            ContentIndex(self.index_dir, workers=2).build(self.searcher, [self.pn])
+        finally:
+            os.umask(old_umask)
+
+        lock = next(Path(self.index_dir, "segments").glob("*/lock"))
+        self.assertEqual(stat.S_IMODE(lock.stat().st_mode), 0o664)
+
+    def test_unchanged_pn_is_not_rewritten(self):
+        ContentIndex(self.index_dir, workers=2).build(self.searcher, [self.pn])
+        manifest = next(Path(self.index_dir, "segments").glob("*/manifest.json"))
+        before = manifest.stat().st_mtime_ns
+
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+        self.assertEqual(index.extracted, 0)
+        self.assertEqual(manifest.stat().st_mtime_ns, before)
+
+    def test_query_survives_concurrent_rebuild(self):
+        index = ContentIndex(self.index_dir, workers=2)
+        index.build(self.searcher, [self.pn])
+        segment = next(Path(self.index_dir, "segments").iterdir())
+        stale = ContentIndex._load_manifest(segment)
+
+        self._write_log("ft_MT003.gz", "ERROR: i2c bus 9 timeout\n")
+        os.utime(self.debug_dir / "ft_MT003.gz", (1, 1))
+        index.build(self.searcher, [self.pn])
+
+        # First read sees the manifest from before the rebuild,
+        # whose postings file is gone by now
+        reader = ContentIndex(self.index_dir)
+        manifests = [stale]
+        reader._load_manifest = lambda seg: manifests.pop() if manifests else ContentIndex._load_manifest(seg)
+        self.assertEqual([m['sn'] for m in reader.query("i2c timeout")], ["MT001", "MT002", "MT003"])
+
+if __name__ == '__main__':
+    unittest.main()
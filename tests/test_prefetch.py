@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import shutil
+import gzip
+import os
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.prefetch import LogPrefetcher
+
+class TestLogPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        self.cache_dir = str(self.root / "prefetch")
+
+        self.logs = []
+        for i in range(3):
+            log = self.root / f"log_SN{i}.gz"
+            with gzip.open(log, 'wt') as f:
+                f.write(f"log {i}\n" + "x" * 1000)
+            self.logs.append(str(log))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_local_copy_is_decompressed(self):
+        prefetcher = LogPrefetcher(self.cache_dir)
+        self.assertIsNone(prefetcher.local_path(self.logs[0]))
+
+        prefetcher.prefetch(self.logs[:1])
+        prefetcher.wait()
+        local = prefetcher.local_path(self.logs[0])
+        self.assertTrue(Path(local).read_text().startswith("log 0\n"))
+
+    def test_cache_dir_is_private(self):
+        LogPrefetcher(self.cache_dir)
+        self.assertEqual(os.stat(self.cache_dir).st_mode & 0o777, 0o700)
+
+    def test_refuses_shared_cache_dir(self):
+        # e.g. created beforehand by someone else in a world-writable place
+        os.mkdir(self.cache_dir)
+        os.chmod(self.cache_dir, 0o777)
+        with self.assertRaises(PermissionError):
+            LogPrefetcher(self.cache_dir)
+
+    def test_removes_partial_copies_of_dead_sessions(self):
+        os.mkdir(self.cache_dir, 0o700)
+        stale = Path(self.cache_dir) / "tmpold.tmp"
+        stale.write_bytes(b"partial")
+        os.utime(str(stale), (1, 1))
+        fresh = Path(self.cache_dir) / "tmpnew.tmp"
+        fresh.write_bytes(b"being written")
+
+        LogPrefetcher(self.cache_dir)
+        self.assertFalse(stale.exists())
+        self.assertTrue(fresh.exists())
+
+    def test_log_larger_than_cap_is_not_cached(self):
+        prefetcher = LogPrefetcher(self.cache_dir, max_bytes=500)
+        prefetcher.prefetch(self.logs[:1])
+        prefetcher.wait()
+        self.assertIsNone(prefetcher.local_path(self.logs[0]))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_changed_log_is_not_served_stale(self):
+        prefetcher = LogPrefetcher(self.cache_dir)
+        prefetcher.prefetch(self.logs[:1])
+        prefetcher.wait()
+
+        with gzip.open(self.logs[0], 'wt') as f:
+            f.write("rewritten\n")
+        os.utime(self.logs[0], (1, 1))
+        self.assertIsNone(prefetcher.local_path(self.logs[0]))
+
+    def test_evicts_least_recently_used(self):
+        # Room for two decompressed logs only
+        prefetcher = LogPrefetcher(self.cache_dir, max_bytes=2500, workers=1)
+        prefetcher.prefetch(self.logs[:2])
+        prefetcher.wait()
+
+        # Touch log 0 so log 1 becomes the least recently used
+        local_0 = prefetcher.local_path(self.logs[0])
+        os.utime(local_0, (os.path.getmtime(local_0) + 10,) * 2)
+
+        prefetcher.prefetch(self.logs[2:])
+        prefetcher.wait()
+        self.assertIsNotNone(prefetcher.local_path(self.logs[0]))
+        self.assertIsNone(prefetcher.local_path(self.logs[1]))
+        self.assertIsNotNone(prefetcher.local_path(self.logs[2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import tempfile
+import shutil
+import gzip
+import os
+import stat
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.summarizer import LogSummarizer
+
+class TestLogSummarizer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        self.cache_dir = str(self.root / "cache")
+
+        self.failed_log = self.root / "log_SN1.gz"
+        with gzip.open(self.failed_log, 'wt') as f:
+            f.write("boot ok\nSTEP: fan_test\nreading sensors\nfan speed 0 rpm - FAILED\nmore output\n")
+
+        self.clean_log = self.root / "log_SN2.gz"
+        self.clean_log.write_text("STEP: fan_test\nall good\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_finds_first_failing_step(self):
+        summary = LogSummarizer(cache_dir=self.cache_dir).summarize(str(self.failed_log))
+        self.assertEqual(summary['status'], "fail")
+        self.assertEqual(summary['step'], "fan_test")
+        self.assertEqual(summary['line'], 4)
+        self.assertEqual(summary['excerpt'][-1], "fan speed 0 rpm - FAILED")
+
+    def test_failing_line_is_not_a_step(self):
+        log = self.root / "log_SN3.gz"
+        log.write_text("STEP: fan_test\nfan test result: FAIL\n")
+        summary = LogSummarizer().summarize(str(log))
+        self.assertEqual(summary['step'], "fan_test")
+
+        log.write_text("boot\nfan TEST FAILED\n")
+        summary = LogSummarizer().summarize(str(log))
+        self.assertIsNone(summary['step'])
+
+    def test_clean_log(self):
+        summary = LogSummarizer().summarize(str(self.clean_log))
+        self.assertEqual(summary['status'], "clean")
+
+    def test_summary_is_cached(self):
+        LogSummarizer(cache_dir=self.cache_dir).summarize(str(self.failed_log))
+
+        # A second session must not re-read the log
+        summarizer = LogSummarizer(cache_dir=self.cache_dir)
+        summarizer._scan = lambda path: self.fail("log was scanned again")
+        self.assertEqual(summarizer.summarize(str(self.failed_log))['step'], "fan_test")
+
+    def test_cache_dirs_are_group_writable(self):
+        old_umask = os.umask(0o022)
+        try:
+            LogSummarizer(cache_dir=self.cache_dir).summarize(str(self.failed_log))
+        finally:
+            os.umask(old_umask)
+
+        for d in Path(self.cache_dir).rglob("*"):
+            if d.is_dir():
+                self.assertEqual(stat.S_IMODE(d.stat().st_mode) & 0o2070, 0o2070, str(d))
+
+    def test_summarize_all_attaches_summaries(self):
+        logs = [{"path": str(self.failed_log)}, {"path": str(self.clean_log)}]
+        LogSummarizer(signatures=[r"all good"]).summarize_all(logs)
+        self.assertEqual(logs[0]['summary']['status'], "clean")
+        self.assertEqual(logs[1]['summary']['status'], "fail")
+
+if __name__ == '__main__':
+    unittest.main()